@@ -9,53 +9,252 @@ This performs targeted, deterministic replacements in a small set of pages:
 
 It intentionally does NOT touch contact pages or legal/privacy pages.
 
+Every replacement is idempotent, so re-running on updated pages changes nothing.
+Write runs also skip files already handled by an earlier run using the record
+kept in .cache/update_positioning.json (mtime, content hash and replacement set
+per file); --check always inspects the files themselves.
+
 Usage:
-  python3 scripts/update_positioning.py            # apply changes
-  python3 scripts/update_positioning.py --check   # no writes, just report
+  python3 scripts/update_positioning.py               # apply changes
+  python3 scripts/update_positioning.py --check      # no writes, just report
+  python3 scripts/update_positioning.py --no-cache   # ignore the cache, process every file
 """
 
 from __future__ import annotations
 
 import argparse
-from dataclasses import dataclass
+import hashlib
+import json
+import mmap
+import re
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from functools import lru_cache
 from pathlib import Path
-from typing import Iterable
+from typing import Iterable, cast
 
 
 ROOT = Path(__file__).resolve().parents[1]
+CACHE_PATH = ROOT / ".cache" / "update_positioning.json"
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Replacement:
     old: str
     new: str
     label: str
+    old_bytes: bytes = field(init=False, repr=False, compare=False)
+    new_bytes: bytes = field(init=False, repr=False, compare=False)
 
+    def __post_init__(self) -> None:
+        # Pages are matched and rewritten as raw UTF-8 bytes.
+        object.__setattr__(self, "old_bytes", self.old.encode("utf-8"))
+        object.__setattr__(self, "new_bytes", self.new.encode("utf-8"))
+        object.__setattr__(self, "label", sys.intern(self.label))
 
-def apply_replacements(text: str, replacements: Iterable[Replacement], *, file_label: str) -> tuple[str, list[str]]:
-    changed_labels: list[str] = []
-    for repl in replacements:
-        if repl.old not in text:
+
+def _overlaps(a: bytes, b: bytes) -> bool:
+    """Return True if an occurrence of ``a`` could share bytes with one of ``b``."""
+    if a in b or b in a:
+        return True
+    for size in range(1, min(len(a), len(b))):
+        if a.endswith(b[:size]) or b.endswith(a[:size]):
+            return True
+    return False
+
+
+@lru_cache(maxsize=None)
+def _plan_passes(replacements: tuple[Replacement, ...]) -> tuple[tuple[int, ...], ...]:
+    """Group replacement indices into passes that can each run as a single scan.
+
+    Replacements are applied in order and a later one may match text produced by an
+    earlier one (phase 4 rewrites phase 1 output), so a replacement only joins the
+    current pass if it cannot interact with anything already in it.
+    """
+    passes: list[tuple[int, ...]] = []
+    current: list[int] = []
+    for i, repl in enumerate(replacements):
+        if any(
+            _overlaps(repl.old_bytes, replacements[j].old_bytes) or _overlaps(repl.old_bytes, replacements[j].new_bytes)
+            for j in current
+        ):
+            passes.append(tuple(current))
+            current = []
+        current.append(i)
+    if current:
+        passes.append(tuple(current))
+    return tuple(passes)
+
+
+@lru_cache(maxsize=None)
+def _compile_pass(
+    replacements: tuple[Replacement, ...]
+) -> tuple[re.Pattern[bytes], tuple[bytes, ...], tuple[str, ...]]:
+    """Compile one pass into its alternation plus the new bytes and label of each group."""
+    # One group per needle, so a match's lastindex says which needle it was.
+    pattern = re.compile(b"|".join(b"(" + re.escape(repl.old_bytes) + b")" for repl in replacements))
+    return pattern, tuple(repl.new_bytes for repl in replacements), tuple(repl.label for repl in replacements)
+
+
+def _pending(data: bytes | mmap.mmap, repl: Replacement) -> bool:
+    """Return True if ``repl`` still has something to replace in ``data``.
+
+    An entry whose ``new`` keeps its own ``old`` (the phase 4 trust lines append a
+    paragraph) would match again on every run, so it counts as applied once ``new`` is
+    present.
+    """
+    if data.find(repl.old_bytes) == -1:
+        return False
+    return repl.old_bytes not in repl.new_bytes or data.find(repl.new_bytes) == -1
+
+
+def _apply(data: bytes | mmap.mmap, replacements: tuple[Replacement, ...]) -> tuple[bytes | mmap.mmap, list[str]]:
+    """Run the passes over ``data``; it is returned as-is if nothing matched, else as bytes."""
+    slots: list[str | None] = [None] * len(replacements)
+    for indices in _plan_passes(replacements):
+        # find() is a C fast search, so dropping absent needles first is cheaper than
+        # letting the alternation try every one of them at each position.
+        indices = tuple(i for i in indices if _pending(data, replacements[i]))
+        if not indices:
             continue
-        text = text.replace(repl.old, repl.new)
-        changed_labels.append(repl.label)
 
-    return text, changed_labels
+        pattern, news, labels = _compile_pass(tuple(replacements[i] for i in indices))
 
+        def substitute(match: re.Match[bytes]) -> bytes:
+            assert match.lastindex is not None  # every alternative is a group
+            k = match.lastindex - 1
+            slots[indices[k]] = labels[k]
+            return news[k]
+
+        data = pattern.sub(substitute, data)
+
+    return data, [label for label in slots if label is not None]
+
+
+def apply_replacements(data: bytes, replacements: Iterable[Replacement], *, file_label: str) -> tuple[bytes, list[str]]:
+    """Apply ``replacements`` in order and return the new data plus the labels that fired.
+
+    Each pass from ``_plan_passes`` finds all of its needles in a single scan of the
+    data and writes the result with one join, so the cost is linear in the page size
+    rather than in the number of replacements.
+    """
+    updated, changed = _apply(data, tuple(replacements))
+    # Substituting over bytes yields bytes, and unmatched input comes back unchanged.
+    return cast(bytes, updated), changed
+
+
+@lru_cache(maxsize=None)
+def _fingerprint(replacements: tuple[Replacement, ...]) -> str:
+    digest = hashlib.sha1()
+    for repl in replacements:
+        digest.update(repl.old_bytes + b"\0" + repl.new_bytes + b"\0")
+    return digest.hexdigest()
+
+
+def load_cache() -> dict[str, list]:
+    try:
+        cache = json.loads(CACHE_PATH.read_bytes())
+    except (FileNotFoundError, ValueError):
+        return {}
+    if not isinstance(cache, dict):
+        return {}
+    # Anything not shaped like [mtime_ns, sha1, fingerprint] is treated as uncached.
+    return {rel_path: entry for rel_path, entry in cache.items() if isinstance(entry, list) and len(entry) == 3}
 
-def main() -> int:
-    parser = argparse.ArgumentParser()
-    parser.add_argument("--check", action="store_true", help="Only report changes; do not write files")
-    args = parser.parse_args()
 
-    targets: dict[Path, list[Replacement]] = {}
+def save_cache(cache: dict[str, list]) -> None:
+    CACHE_PATH.parent.mkdir(exist_ok=True)
+    CACHE_PATH.write_bytes((json.dumps(cache, indent=2, sort_keys=True) + "\n").encode("utf-8"))
 
-    def add(rel_path: str, *repls: Replacement) -> None:
-        path = ROOT / rel_path
-        targets.setdefault(path, []).extend(repls)
 
+@dataclass(frozen=True)
+class FileResult:
+    """Outcome for one target.
+
+    ``cache_entry`` is ``[mtime_ns, sha1, fingerprint]`` for the file after this run;
+    ``warning`` is set when the file was missing or could not be processed, and ``crlf``
+    when it has CRLF line endings that the LF-only needles cannot match.
+    """
+
+    rel_path: str
+    changed: list[str]
+    cache_entry: list | None = None
+    warning: str | None = None
+    failed: bool = False
+    crlf: bool = False
+
+
+def process_one(item: tuple[str, tuple[Replacement, ...]], check: bool, cache: dict[str, list]) -> FileResult:
+    """Apply one target's replacements, turning I/O errors into a warning for that file."""
+    rel_path = item[0]
+    try:
+        return _process_file(item, check, cache)
+    except FileNotFoundError:
+        return FileResult(rel_path, [], warning=f"Missing: {rel_path}")
+    except OSError as exc:
+        return FileResult(rel_path, [], warning=f"Failed: {rel_path} ({exc})", failed=True)
+
+
+def _process_file(item: tuple[str, tuple[Replacement, ...]], check: bool, cache: dict[str, list]) -> FileResult:
+    rel_path, repls = item
+    path = ROOT / rel_path
+    stat = path.stat()
+
+    fingerprint = _fingerprint(repls)
+    cached = cache.get(rel_path)
+    original: bytes | None = None
+    if cached is not None and cached[2] == fingerprint:
+        if cached[0] == stat.st_mtime_ns:
+            return FileResult(rel_path, [], cached)
+        # Touched since the last run; unchanged content means there is nothing to do.
+        original = path.read_bytes()
+        if cached[1] == hashlib.sha1(original).hexdigest():
+            return FileResult(rel_path, [], [stat.st_mtime_ns, cached[1], fingerprint], crlf=b"\r\n" in original)
+
+    if check and original is None:
+        if stat.st_size == 0:
+            return FileResult(rel_path, [])
+        # Only the labels matter here, so search the page cache directly instead of copying the file.
+        with path.open("rb") as handle, mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as view:
+            crlf = view.find(b"\r\n") != -1
+            updated, changed = _apply(view, repls)
+            if updated is not view:
+                with memoryview(view) as buffer:
+                    if buffer == updated:
+                        changed = []
+        return FileResult(rel_path, changed, crlf=crlf)
+
+    if original is None:
+        original = path.read_bytes()
+    crlf = b"\r\n" in original
+    updated, changed = apply_replacements(original, repls, file_label=str(path))
+    if updated == original:
+        entry = [stat.st_mtime_ns, hashlib.sha1(original).hexdigest(), fingerprint]
+        return FileResult(rel_path, [], entry, crlf=crlf)
+    if check:
+        return FileResult(rel_path, changed, crlf=crlf)
+
+    path.write_bytes(updated)
+    entry = [path.stat().st_mtime_ns, hashlib.sha1(updated).hexdigest(), fingerprint]
+    return FileResult(rel_path, changed, entry, crlf=crlf)
+
+
+def _target(rel_path: str, *repls: Replacement) -> tuple[str, tuple[Replacement, ...]]:
+    return rel_path, repls
+
+
+def _merge(*targets: tuple[str, tuple[Replacement, ...]]) -> tuple[tuple[str, tuple[Replacement, ...]], ...]:
+    """Concatenate entries for the same file, keeping first-seen order."""
+    merged: dict[str, list[Replacement]] = {}
+    for rel_path, repls in targets:
+        merged.setdefault(rel_path, []).extend(repls)
+    return tuple((rel_path, tuple(repls)) for rel_path, repls in merged.items())
+
+
+TARGETS: tuple[tuple[str, tuple[Replacement, ...]], ...] = _merge(
     # --- INDEX pages ---
-    add(
+    _target(
         "en/index.html",
         Replacement(
             old='            <p class="lead">We build focused, practical software that uses artificial intelligence where it provides clear value. No hype. No subscriptions. No data harvesting.</p>',
@@ -77,9 +276,9 @@ def main() -> int:
             new='                <p>A learning application built around the idea that you bring the content, we provide the methods. AI assists with structure and clarity—while understanding stays with the learner.</p>',
             label="en:index:project-ai-line",
         ),
-    )
+    ),
 
-    add(
+    _target(
         "de/index.html",
         Replacement(
             old='            <p class="lead">Wir entwickeln fokussierte, praktische Software, die künstliche Intelligenz dort einsetzt, wo sie klaren Nutzen bringt. Kein Hype. Keine Abos. Kein Datensammeln.</p>',
@@ -101,9 +300,9 @@ def main() -> int:
             new='                <p>Eine Lernanwendung, die auf der Idee basiert, dass du die Inhalte mitbringst und wir die Methoden bereitstellen. KI unterstützt mit Struktur und Klarheit – während das Verstehen bei dir bleibt.</p>',
             label="de:index:project-ai-line",
         ),
-    )
+    ),
 
-    add(
+    _target(
         "fr/index.html",
         Replacement(
             old='            <p class="lead">Nous créons des logiciels ciblés et pratiques qui utilisent l\'intelligence artificielle là où elle apporte une valeur claire. Pas de battage médiatique. Pas d\'abonnements. Pas de collecte de données.</p>',
@@ -125,9 +324,9 @@ def main() -> int:
             new='                <p>Une application d\'apprentissage basée sur l\'idée que vous apportez le contenu et nous fournissons les méthodes. L\'IA assiste avec structure et clarté — tout en laissant la compréhension à l\'apprenant.</p>',
             label="fr:index:project-ai-line",
         ),
-    )
+    ),
 
-    add(
+    _target(
         "es/index.html",
         Replacement(
             old='            <p class="lead">Construimos software enfocado y práctico que usa inteligencia artificial donde aporta valor claro. Sin exageraciones. Sin suscripciones. Sin recopilación de datos.</p>',
@@ -149,9 +348,9 @@ def main() -> int:
             new='                <p>Una aplicación de aprendizaje basada en la idea de que tú aportas el contenido y nosotros proporcionamos los métodos. La IA asiste con estructura y claridad, mientras el entendimiento sigue siendo tuyo.</p>',
             label="es:index:project-ai-line",
         ),
-    )
+    ),
 
-    add(
+    _target(
         "it/index.html",
         Replacement(
             old='            <p class="lead">Costruiamo software mirato e pratico che utilizza l\'intelligenza artificiale dove apporta valore chiaro. Niente hype. Niente abbonamenti. Niente raccolta dati.</p>',
@@ -173,9 +372,9 @@ def main() -> int:
             new='                <p>Un\'applicazione di apprendimento basata sull\'idea che tu porti i contenuti e noi forniamo i metodi. L\'IA assiste con struttura e chiarezza — mentre la comprensione resta a te.</p>',
             label="it:index:project-ai-line",
         ),
-    )
+    ),
 
-    add(
+    _target(
         "nl/index.html",
         Replacement(
             old='            <p class="lead">We bouwen gerichte, praktische software die kunstmatige intelligentie gebruikt waar het duidelijke waarde biedt. Geen hype. Geen abonnementen. Geen dataverzameling.</p>',
@@ -197,10 +396,10 @@ def main() -> int:
             new='                <p>Een leerapplicatie gebaseerd op het idee dat jij de inhoud meebrengt en wij de methoden bieden. AI helpt met structuur en duidelijkheid—terwijl begrip bij de leerling blijft.</p>',
             label="nl:index:project-ai-line",
         ),
-    )
+    ),
 
     # --- ABOUT pages ---
-    add(
+    _target(
         "en/about.html",
         Replacement(
             old='            <h2>What we don\'t do</h2>',
@@ -227,9 +426,9 @@ def main() -> int:
             new='            <p>Our business model is product-first. We charge transparently when appropriate and may use advertising to support free features, but we don\'t sell user data.</p>',
             label="en:about:business-model",
         ),
-    )
+    ),
 
-    add(
+    _target(
         "de/about.html",
         Replacement(
             old='            <h2>Was wir nicht tun</h2>',
@@ -256,9 +455,9 @@ def main() -> int:
             new='            <p>Unser Modell ist produktorientiert. Wir verlangen transparent Geld, wenn es angemessen ist, und können Werbung nutzen, um kostenlose Funktionen zu unterstützen – verkaufen aber keine Nutzerdaten.</p>',
             label="de:about:business-model",
         ),
-    )
+    ),
 
-    add(
+    _target(
         "fr/about.html",
         Replacement(
             old='            <h2>Ce que nous ne faisons pas</h2>',
@@ -285,9 +484,9 @@ def main() -> int:
             new='            <p>Notre modèle est orienté produit. Nous facturons de manière transparente lorsque c\'est approprié et pouvons utiliser la publicité pour soutenir des fonctionnalités gratuites, mais nous ne vendons pas de données utilisateur.</p>',
             label="fr:about:business-model",
         ),
-    )
+    ),
 
-    add(
+    _target(
         "es/about.html",
         Replacement(
             old='            <h2>Lo que no hacemos</h2>',
@@ -314,9 +513,9 @@ def main() -> int:
             new='            <p>Nuestro modelo es orientado a producto. Cobramos de forma transparente cuando es apropiado y podemos usar publicidad para apoyar funciones gratuitas, pero no vendemos datos de usuario.</p>',
             label="es:about:business-model",
         ),
-    )
+    ),
 
-    add(
+    _target(
         "it/about.html",
         Replacement(
             old='            <h2>Cosa non facciamo</h2>',
@@ -343,9 +542,9 @@ def main() -> int:
             new='            <p>Il nostro modello è orientato al prodotto. Facciamo pagare in modo trasparente quando appropriato e possiamo usare pubblicità per supportare funzionalità gratuite, ma non vendiamo dati utente.</p>',
             label="it:about:business-model",
         ),
-    )
+    ),
 
-    add(
+    _target(
         "nl/about.html",
         Replacement(
             old='            <h2>Wat we niet doen</h2>',
@@ -372,10 +571,10 @@ def main() -> int:
             new='            <p>Onze applicaties zijn producten met duidelijke grenzen. We rekenen er transparant voor wanneer dat gepast is. Ons model is productgericht, zonder afhankelijk te zijn van advertenties of het vermarkten van gebruikersgegevens.</p>',
             label="nl:about:business-model",
         ),
-    )
+    ),
 
     # --- PRINCIPLES pages ---
-    add(
+    _target(
         "en/principles.html",
         Replacement(
             old='                <h3>No subscriptions</h3>\n                <p>We charge for applications when appropriate, but we don\'t lock features behind recurring payments. If you buy something, you own it.</p>',
@@ -412,9 +611,9 @@ def main() -> int:
             new='                <h3>Clear boundaries</h3>\n                <p>Each application has a specific purpose. We build tools with a tight scope that do one thing well.</p>',
             label="en:principles:boundaries",
         ),
-    )
+    ),
 
-    add(
+    _target(
         "de/principles.html",
         Replacement(
             old='                <h3>Keine Abos</h3>\n                <p>Wir verlangen Geld für Anwendungen, wenn es angemessen ist, aber wir sperren keine Funktionen hinter wiederkehrenden Zahlungen. Wenn du etwas kaufst, gehört es dir.</p>',
@@ -451,9 +650,9 @@ def main() -> int:
             new='                <h3>Klare Grenzen</h3>\n                <p>Jede Anwendung hat einen spezifischen Zweck. Wir bauen Werkzeuge mit bewusst engem Umfang, die eine Sache gut machen.</p>',
             label="de:principles:boundaries",
         ),
-    )
+    ),
 
-    add(
+    _target(
         "fr/principles.html",
         Replacement(
             old='                <h3>Pas d\'abonnements</h3>\n                <p>Nous facturons les applications lorsque cela est approprié, mais nous ne verrouillons pas les fonctionnalités derrière des paiements récurrents. Si vous achetez quelque chose, vous le possédez.</p>',
@@ -490,9 +689,9 @@ def main() -> int:
             new='                <h3>Limites claires</h3>\n                <p>Chaque application a un objectif spécifique. Nous construisons des outils au périmètre resserré qui font bien une chose.</p>',
             label="fr:principles:boundaries",
         ),
-    )
+    ),
 
-    add(
+    _target(
         "es/principles.html",
         Replacement(
             old='                <h3>Sin suscripciones</h3>\n                <p>Cobramos por aplicaciones cuando es apropiado, pero no bloqueamos características detrás de pagos recurrentes. Si compras algo, te pertenece.</p>',
@@ -529,9 +728,9 @@ def main() -> int:
             new='                <h3>Límites claros</h3>\n                <p>Cada aplicación tiene un propósito específico. Construimos herramientas con un alcance deliberadamente ajustado que hacen bien una cosa.</p>',
             label="es:principles:boundaries",
         ),
-    )
+    ),
 
-    add(
+    _target(
         "it/principles.html",
         Replacement(
             old='                <h3>Niente abbonamenti</h3>\n                <p>Facciamo pagare le applicazioni quando appropriato, ma non blocchiamo le funzionalità dietro pagamenti ricorrenti. Se acquisti qualcosa, è tuo.</p>',
@@ -568,9 +767,9 @@ def main() -> int:
             new='                <h3>Confini chiari</h3>\n                <p>Ogni applicazione ha uno scopo specifico. Costruiamo strumenti con uno scopo volutamente ristretto che fanno bene una cosa.</p>',
             label="it:principles:boundaries",
         ),
-    )
+    ),
 
-    add(
+    _target(
         "nl/principles.html",
         Replacement(
             old='                <h3>Geen abonnementen</h3>\n                <p>We rekenen voor applicaties wanneer dat gepast is, maar we vergrendelen functies niet achter terugkerende betalingen. Als je iets koopt, bezit je het.</p>',
@@ -607,210 +806,236 @@ def main() -> int:
             new='                <h3>Duidelijke grenzen</h3>\n                <p>Elke applicatie heeft een specifiek doel. We bouwen hulpmiddelen met een bewust strakke scope die één ding goed doen.</p>',
             label="nl:principles:boundaries",
         ),
-    )
+    ),
 
     # --- PHASE 4: Content tightening & trust signals ---
     # Home lead: make it more concrete (what we build + for whom).
-    add(
+    _target(
         "en/index.html",
         Replacement(
             old='            <p class="lead">Some say AI will save us. Others say doomsday is near. We see a helpful tool—when used with care. We build focused applications that help people use AI to their advantage.</p>',
             new='            <p class="lead">We build calm, focused products for learning and work. We use AI where it adds clear value—and keep the experience simple, understandable, and user-controlled.</p>',
             label="en:index:lead:phase4",
         ),
-    )
-    add(
+    ),
+    _target(
         "de/index.html",
         Replacement(
             old='            <p class="lead">Manche sagen, KI sei unser Retter. Andere sagen, der Untergang sei nah. Wir sehen ein hilfreiches Werkzeug – wenn es richtig eingesetzt wird. Wir bauen fokussierte Anwendungen, die Menschen helfen, KI zu ihrem Vorteil zu nutzen.</p>',
             new='            <p class="lead">Wir bauen ruhige, fokussierte Produkte fürs Lernen und Arbeiten. Wir setzen KI dort ein, wo sie klaren Nutzen bringt – und halten alles einfach, verständlich und unter Kontrolle des Nutzers.</p>',
             label="de:index:lead:phase4",
         ),
-    )
-    add(
+    ),
+    _target(
         "fr/index.html",
         Replacement(
             old='            <p class="lead">Certains disent que l\'IA nous sauvera, d\'autres que la fin est proche. Nous y voyons surtout un outil utile — lorsqu\'il est bien utilisé. Nous construisons des applications ciblées qui aident les gens à tirer parti de l\'IA.</p>',
             new='            <p class="lead">Nous construisons des produits calmes et ciblés pour apprendre et travailler. Nous utilisons l\'IA là où elle apporte une valeur claire — en gardant l\'expérience simple, compréhensible et sous le contrôle de l\'utilisateur.</p>',
             label="fr:index:lead:phase4",
         ),
-    )
-    add(
+    ),
+    _target(
         "es/index.html",
         Replacement(
             old='            <p class="lead">Algunos dicen que la IA será nuestro salvador; otros, que el fin está cerca. Nosotros la vemos como una herramienta útil, si se usa bien. Construimos aplicaciones enfocadas que ayudan a las personas a aprovechar la IA a su favor.</p>',
             new='            <p class="lead">Construimos productos tranquilos y enfocados para aprender y trabajar. Usamos la IA donde aporta valor claro, manteniendo la experiencia simple, comprensible y bajo el control del usuario.</p>',
             label="es:index:lead:phase4",
         ),
-    )
-    add(
+    ),
+    _target(
         "it/index.html",
         Replacement(
             old='            <p class="lead">C\'è chi dice che l\'IA ci salverà e chi parla di fine imminente. Noi la vediamo come uno strumento utile, se usato bene. Costruiamo applicazioni mirate che aiutano le persone a usare l\'IA a proprio vantaggio.</p>',
             new='            <p class="lead">Costruiamo prodotti calmi e mirati per imparare e lavorare. Usiamo l\'IA dove porta valore chiaro, mantenendo l\'esperienza semplice, comprensibile e sotto il controllo dell\'utente.</p>',
             label="it:index:lead:phase4",
         ),
-    )
-    add(
+    ),
+    _target(
         "nl/index.html",
         Replacement(
             old='            <p class="lead">Sommigen zeggen dat AI onze redder is, anderen dat het einde nabij is. Wij zien vooral een handig hulpmiddel—als je het goed inzet. We bouwen gerichte applicaties die mensen helpen AI in hun voordeel te gebruiken.</p>',
             new='            <p class="lead">We bouwen rustige, gerichte producten om te leren en te werken. We gebruiken AI waar het duidelijke waarde toevoegt—en houden de ervaring simpel, begrijpelijk en onder controle van de gebruiker.</p>',
             label="nl:index:lead:phase4",
         ),
-    )
-    add(
+    ),
+    _target(
         "sv/index.html",
         Replacement(
             old='            <p class="lead">Vissa säger att AI kommer rädda oss. Andra säger att undergången är nära. Vi ser ett användbart verktyg—när det används med omsorg. Vi bygger fokuserade applikationer som hjälper människor att använda AI till sin fördel.</p>',
             new='            <p class="lead">Vi bygger lugna, fokuserade produkter för lärande och arbete. Vi använder AI där det ger tydligt värde—och håller upplevelsen enkel, begriplig och under användarens kontroll.</p>',
             label="sv:index:lead:phase4",
         ),
-    )
+    ),
 
     # About: replace the redundant AI section with a short “what to expect” section.
-    add(
+    _target(
         "en/about.html",
         Replacement(
             old='        <section>\n            <h2>AI as a tool</h2>\n            <p>AI can be useful when applied with care. It can help clarify, organize, and reduce repetitive work. We use it where it provides clear value, and keep the experience understandable and under the user\'s control.</p>\n        </section>',
             new='        <section>\n            <h2>What to expect</h2>\n            <p><strong>Product-first:</strong> we build and maintain our own applications (no client work).</p>\n            <p><strong>Calm by default:</strong> clear boundaries, minimal notifications, no dark patterns.</p>\n            <p><strong>Privacy-minded:</strong> data minimization and transparent monetization.</p>\n        </section>',
             label="en:about:expectations:phase4",
         ),
-    )
-    add(
+    ),
+    _target(
         "de/about.html",
         Replacement(
             old='        <section>\n            <h2>KI als Werkzeug</h2>\n            <p>KI kann nützlich sein, wenn sie sorgfältig eingesetzt wird. Sie kann helfen, Dinge zu klären, zu organisieren und repetitive Arbeit zu reduzieren. Wir setzen sie dort ein, wo sie klaren Nutzen bringt, und gestalten Anwendungen so, dass sie verständlich bleiben und die Kontrolle beim Nutzer lassen.</p>\n        </section>',
             new='        <section>\n            <h2>Was du erwarten kannst</h2>\n            <p><strong>Produktfokus:</strong> Wir entwickeln und pflegen eigene Anwendungen (keine Kundenprojekte).</p>\n            <p><strong>Ruhig standardmäßig:</strong> klare Grenzen, wenige Benachrichtigungen, keine Dark Patterns.</p>\n            <p><strong>Datenschutzbewusst:</strong> Datensparsamkeit und transparente Monetarisierung.</p>\n        </section>',
             label="de:about:expectations:phase4",
         ),
-    )
-    add(
+    ),
+    _target(
         "fr/about.html",
         Replacement(
             old='        <section>\n            <h2>L\'IA comme outil</h2>\n            <p>L\'IA peut être utile lorsqu\'elle est appliquée avec soin. Elle peut aider à clarifier, organiser et réduire le travail répétitif. Nous l\'utilisons là où elle apporte une valeur claire, tout en gardant l\'expérience compréhensible et sous le contrôle de l\'utilisateur.</p>\n        </section>',
             new='        <section>\n            <h2>À quoi s\'attendre</h2>\n            <p><strong>Produit d\'abord :</strong> nous construisons et maintenons nos propres applications (pas de missions client).</p>\n            <p><strong>Calme par défaut :</strong> limites claires, peu de notifications, pas de dark patterns.</p>\n            <p><strong>Respect de la vie privée :</strong> minimisation des données et monétisation transparente.</p>\n        </section>',
             label="fr:about:expectations:phase4",
         ),
-    )
-    add(
+    ),
+    _target(
         "es/about.html",
         Replacement(
             old='        <section>\n            <h2>IA como herramienta</h2>\n            <p>La IA puede ser útil cuando se aplica con cuidado. Puede ayudar a aclarar, organizar y reducir el trabajo repetitivo. La usamos donde aporta valor claro, manteniendo la experiencia entendible y bajo control del usuario.</p>\n        </section>',
             new='        <section>\n            <h2>Qué esperar</h2>\n            <p><strong>Producto primero:</strong> construimos y mantenemos nuestras propias aplicaciones (sin trabajo para clientes).</p>\n            <p><strong>Calma por defecto:</strong> límites claros, pocas notificaciones, sin dark patterns.</p>\n            <p><strong>Privacidad:</strong> minimización de datos y monetización transparente.</p>\n        </section>',
             label="es:about:expectations:phase4",
         ),
-    )
-    add(
+    ),
+    _target(
         "it/about.html",
         Replacement(
             old='        <section>\n            <h2>L\'IA come strumento</h2>\n            <p>L\'IA può essere utile quando applicata con cura. Può aiutare a chiarire, organizzare e ridurre il lavoro ripetitivo. Lausiamo dove apporta valore chiaro, mantenendo l\'esperienza comprensibile e sotto il controllo dell\'utente.</p>\n        </section>',
             new='        <section>\n            <h2>Cosa aspettarsi</h2>\n            <p><strong>Prodotto prima di tutto:</strong> costruiamo e manteniamo le nostre applicazioni (niente lavori per clienti).</p>\n            <p><strong>Calmo per impostazione predefinita:</strong> confini chiari, poche notifiche, niente dark pattern.</p>\n            <p><strong>Privacy:</strong> minimizzazione dei dati e monetizzazione trasparente.</p>\n        </section>',
             label="it:about:expectations:phase4",
         ),
-    )
-    add(
+    ),
+    _target(
         "nl/about.html",
         Replacement(
             old='        <section>\n            <h2>AI als hulpmiddel</h2>\n            <p>AI kan nuttig zijn wanneer het zorgvuldig wordt toegepast. Het kan helpen om te verduidelijken, te organiseren en repetitief werk te verminderen. We gebruiken het waar het duidelijke waarde biedt, terwijl we de ervaring begrijpelijk houden en onder controle van de gebruiker.</p>\n        </section>',
             new='        <section>\n            <h2>Wat je kunt verwachten</h2>\n            <p><strong>Product-first:</strong> we bouwen en onderhouden onze eigen applicaties (geen klantwerk).</p>\n            <p><strong>Standaard rustig:</strong> duidelijke grenzen, weinig meldingen, geen dark patterns.</p>\n            <p><strong>Privacy:</strong> dataminimalisatie en transparante monetisatie.</p>\n        </section>',
             label="nl:about:expectations:phase4",
         ),
-    )
-    add(
+    ),
+    _target(
         "sv/about.html",
         Replacement(
             old='        <section>\n            <h2>AI som ett verktyg</h2>\n            <p>AI kan vara användbart när det används med omsorg. Det kan hjälpa till att förtydliga, organisera och minska repetitivt arbete. Vi använder det där det ger tydligt värde och håller upplevelsen begriplig och under användarens kontroll.</p>\n        </section>',
             new='        <section>\n            <h2>Vad du kan förvänta dig</h2>\n            <p><strong>Produkt först:</strong> vi bygger och underhåller våra egna applikationer (inget kundarbete).</p>\n            <p><strong>Lugnt som standard:</strong> tydliga gränser, få notiser, inga dark patterns.</p>\n            <p><strong>Integritet:</strong> dataminimering och transparent monetisering.</p>\n        </section>',
             label="sv:about:expectations:phase4",
         ),
-    )
+    ),
 
     # Projects: add quick trust signals under the lœrn card.
-    add(
+    _target(
         "en/projects.html",
         Replacement(
             old='                <p>Offline flashcards: create your own cards, organize decks, and study with active recall—no account, no cloud. Import content, including cards generated with your own AI.</p>',
             new='                <p>Offline flashcards: create your own cards, organize decks, and study with active recall—no account, no cloud. Import content, including cards generated with your own AI.</p>\n                <p>Offline-first. No account. Your learning data stays on your device.</p>',
             label="en:projects:loern-trust:phase4",
         ),
-    )
-    add(
+    ),
+    _target(
         "de/projects.html",
         Replacement(
             old='                <p>Offline Karteikarten-App: Erstelle eigene Lernkarten, organisiere Decks und lerne mit aktivem Wiederholen – ohne Konto und ohne Cloud. Inhalte kannst du importieren, auch wenn sie mit deiner eigenen KI erstellt wurden.</p>',
             new='                <p>Offline Karteikarten-App: Erstelle eigene Lernkarten, organisiere Decks und lerne mit aktivem Wiederholen – ohne Konto und ohne Cloud. Inhalte kannst du importieren, auch wenn sie mit deiner eigenen KI erstellt wurden.</p>\n                <p>Offline-first. Kein Konto. Deine Lerndaten bleiben auf deinem Gerät.</p>',
             label="de:projects:loern-trust:phase4",
         ),
-    )
-    add(
+    ),
+    _target(
         "fr/projects.html",
         Replacement(
             old='                <p>Flashcards hors ligne : créez vos cartes, organisez des decks et révisez avec rappel actif — sans compte, sans cloud. Importez du contenu, y compris des cartes générées avec votre propre IA.</p>',
             new='                <p>Flashcards hors ligne : créez vos cartes, organisez des decks et révisez avec rappel actif — sans compte, sans cloud. Importez du contenu, y compris des cartes générées avec votre propre IA.</p>\n                <p>Hors ligne d\'abord. Pas de compte. Vos données d\'apprentissage restent sur votre appareil.</p>',
             label="fr:projects:loern-trust:phase4",
         ),
-    )
-    add(
+    ),
+    _target(
         "es/projects.html",
         Replacement(
             old='                <p>Flashcards offline: crea tus tarjetas, organiza mazos y repasa con repetición activa — sin cuenta, sin nube. Importa contenido, incluso tarjetas generadas con tu propia IA.</p>',
             new='                <p>Flashcards offline: crea tus tarjetas, organiza mazos y repasa con repetición activa — sin cuenta, sin nube. Importa contenido, incluso tarjetas generadas con tu propia IA.</p>\n                <p>Offline primero. Sin cuenta. Tus datos de aprendizaje se quedan en tu dispositivo.</p>',
             label="es:projects:loern-trust:phase4",
         ),
-    )
-    add(
+    ),
+    _target(
         "it/projects.html",
         Replacement(
             old='                <p>Flashcard offline: crea le tue schede, organizza i mazzi e ripassa con richiamo attivo — senza account, senza cloud. Importa contenuti, anche schede generate con la tua IA.</p>',
             new='                <p>Flashcard offline: crea le tue schede, organizza i mazzi e ripassa con richiamo attivo — senza account, senza cloud. Importa contenuti, anche schede generate con la tua IA.</p>\n                <p>Offline prima di tutto. Nessun account. I tuoi dati di studio restano sul tuo dispositivo.</p>',
             label="it:projects:loern-trust:phase4",
         ),
-    )
-    add(
+    ),
+    _target(
         "nl/projects.html",
         Replacement(
             old='                <p>Offline flashcards: maak je eigen kaarten, organiseer decks en studeer met actieve herhaling — geen account, geen cloud. Importeer content, ook kaarten die met je eigen AI zijn gemaakt.</p>',
             new='                <p>Offline flashcards: maak je eigen kaarten, organiseer decks en studeer met actieve herhaling — geen account, geen cloud. Importeer content, ook kaarten die met je eigen AI zijn gemaakt.</p>\n                <p>Offline-first. Geen account. Je leerdata blijft op je apparaat.</p>',
             label="nl:projects:loern-trust:phase4",
         ),
-    )
-    add(
+    ),
+    _target(
         "sv/projects.html",
         Replacement(
             old='                <p>Offline-flashcards: skapa dina egna kort, organisera kortlekar och plugga med aktiv återkallelse—inget konto, inget moln. Importera innehåll, även kort som skapats med din egen AI.</p>',
             new='                <p>Offline-flashcards: skapa dina egna kort, organisera kortlekar och plugga med aktiv återkallelse—inget konto, inget moln. Importera innehåll, även kort som skapats med din egen AI.</p>\n                <p>Offline först. Inget konto. Dina studiedata stannar på din enhet.</p>',
             label="sv:projects:loern-trust:phase4",
         ),
-    )
+    ),
+)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--check", action="store_true", help="Only report changes; do not write files")
+    parser.add_argument("--no-cache", action="store_true", help="Ignore the cache of files handled by earlier runs")
+    args = parser.parse_args()
 
     # Apply changes
+    # --check reports what a write would do to the bytes on disk, whatever earlier runs recorded.
+    cache = {} if args.no_cache or args.check else load_cache()
+    with ThreadPoolExecutor(max_workers=len(TARGETS)) as executor:
+        futures = [executor.submit(process_one, item, args.check, cache) for item in TARGETS]
+
+    # Workers write as they go, so report and cache every finished file before
+    # surfacing an unexpected error from any of them.
+    results: list[FileResult] = []
+    error: BaseException | None = None
+    for future in futures:
+        exc = future.exception()
+        if exc is None:
+            results.append(future.result())
+        elif error is None:
+            error = exc
+
     any_changed = False
-    for path, repls in targets.items():
-        if not path.exists():
-            print(f"[WARN] Missing: {path.relative_to(ROOT)}")
+    report: list[str] = []
+    for result in results:
+        if result.warning is not None:
+            report.append(f"[WARN] {result.warning}\n")
             continue
 
-        original = path.read_text(encoding="utf-8")
-        updated, changed = apply_replacements(original, repls, file_label=str(path))
+        if result.crlf:
+            # Pages are matched as raw bytes, so multi-line needles (written with LF) miss here.
+            report.append(f"[WARN] {result.rel_path} has CRLF line endings; multi-line replacements will not match\n")
 
-        if not changed:
-            print(f"[OK]   {path.relative_to(ROOT)} (no changes)")
+        if not result.changed:
+            report.append(f"[OK]   {result.rel_path} (no changes)\n")
             continue
 
         any_changed = True
-        print(f"[EDIT] {path.relative_to(ROOT)} -> {', '.join(changed)}")
-
-        if not args.check:
-            path.write_text(updated, encoding="utf-8")
-
-    if args.check:
-        return 0
+        report.append(f"[EDIT] {result.rel_path} -> {', '.join(result.changed)}\n")
 
-    if not any_changed:
-        print("No changes applied.")
+    if not args.check:
+        # CRLF pages stay uncached so every run repeats their warning.
+        save_cache({r.rel_path: r.cache_entry for r in results if r.cache_entry is not None and not r.crlf})
+        if not any_changed:
+            report.append("No changes applied.\n")
 
-    return 0
+    sys.stdout.write("".join(report))
+    if error is not None:
+        raise error
+    return 1 if any(result.failed for result in results) else 0
 
 
 if __name__ == "__main__":